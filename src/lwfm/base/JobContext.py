@@ -112,10 +112,10 @@ class JobContext(LwfmBase):
 
 
     def __str__(self):
-        return f"[ctx id:{self.getId()} native:{self.getNativeId()} " + \
-            f"parent:{self.getParentJobId()} origin:{self.getOriginJobId()} " + \
-            f"set:{self.getJobSetId()} site:{self.getSiteName()} " + \
-            f"compute:{self.getComputeType()}]"
+        return (f"[ctx id:{self.getId()} native:{self.getNativeId()} "
+                f"parent:{self.getParentJobId()} origin:{self.getOriginJobId()} "
+                f"set:{self.getJobSetId()} site:{self.getSiteName()} "
+                f"compute:{self.getComputeType()}]")
     
 
 
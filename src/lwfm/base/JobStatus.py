@@ -32,6 +32,11 @@ class JobStatusValues(Enum):
     CANCELLED = "CANCELLED"  # terminal state
 
 
+_TERMINAL_STATUSES = frozenset((JobStatusValues.COMPLETE, 
+                                JobStatusValues.FAILED, 
+                                JobStatusValues.CANCELLED))
+
+
 # ***********************************************************************
 
 
@@ -53,7 +58,19 @@ class JobStatus(LwfmBase):
     status strings.  Native lwfm local jobs will use a pass-thru mapping.
     """
 
-    statusMap: dict = None  # maps native status to canonical status
+    # maps native status to canonical status - subclasses override it at class
+    # level, so it is shared rather than pickled with every status 
+    statusMap: dict = {
+        "UNKNOWN": JobStatusValues.UNKNOWN,
+        "READY": JobStatusValues.READY,
+        "PENDING": JobStatusValues.PENDING,
+        "RUNNING": JobStatusValues.RUNNING,
+        "INFO": JobStatusValues.INFO,
+        "FINISHING": JobStatusValues.FINISHING,
+        "COMPLETE": JobStatusValues.COMPLETE,
+        "FAILED": JobStatusValues.FAILED,
+        "CANCELLED": JobStatusValues.CANCELLED,
+    }
     jobContext: JobContext = None  # job id tracking info
 
     def __init__(self, jobContext: JobContext = None):
@@ -62,20 +79,6 @@ class JobStatus(LwfmBase):
             self.jobContext = JobContext()
         else:
             self.jobContext = jobContext
-        # default map
-        self.setStatusMap(
-            {
-                "UNKNOWN": JobStatusValues.UNKNOWN,
-                "READY": JobStatusValues.READY,
-                "PENDING": JobStatusValues.PENDING,
-                "RUNNING": JobStatusValues.RUNNING,
-                "INFO": JobStatusValues.INFO,
-                "FINISHING": JobStatusValues.FINISHING,
-                "COMPLETE": JobStatusValues.COMPLETE,
-                "FAILED": JobStatusValues.FAILED,
-                "CANCELLED": JobStatusValues.CANCELLED,
-            }
-        )
         self.setReceivedTime(datetime.utcnow())
         self.setStatus(JobStatusValues.UNKNOWN)
 
@@ -162,11 +165,7 @@ class JobStatus(LwfmBase):
         return self.getStatus() == JobStatusValues.CANCELLED
 
     def isTerminal(self) -> bool:
-        return (
-            self.isTerminalSuccess()
-            or self.isTerminalFailure()
-            or self.isTerminalCancelled()
-        )
+        return self.getStatus() in _TERMINAL_STATUSES
 
 
     def __str__(self):
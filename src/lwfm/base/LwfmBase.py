@@ -8,7 +8,7 @@
 from abc import ABC
 import uuid
 import pickle
-import json
+import base64
 import sys
 import random 
 
@@ -49,15 +49,29 @@ class LwfmBase(ABC):
             args = dict()
         self.args = dict(args)
 
+    # the text form - what is stored - is the binary pickle in base64, about a 
+    # sixth smaller than a protocol 0 pickle once JSON has escaped it, and 
+    # quicker both ways
     def serialize(self):
-        out_bytes = pickle.dumps(self, 0)
-        out_str = out_bytes.decode(encoding="ascii")
-        return out_str
+        return base64.b64encode(pickle.dumps(self, pickle.HIGHEST_PROTOCOL)) \
+            .decode(encoding="ascii")
 
     @staticmethod
     def deserialize(s: str):
-        in_json = json.dumps(s)
-        return pickle.loads(json.loads(in_json).encode(encoding="ascii"))
+        # a binary pickle starts with the PROTO opcode, which base64 renders 
+        # as "g" - anything else is a protocol 0 pickle written before
+        if (s[:1] == "g"):
+            return pickle.loads(base64.b64decode(s))
+        return pickle.loads(s.encode(encoding="ascii"))
+
+    # binary forms for the wire - no text-safe encoding to inflate the payload
+    # or to undo on the other side
+    def serializeBytes(self) -> bytes:
+        return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def deserializeBytes(b: bytes):
+        return pickle.loads(b)
 
 # UUID generator used to give jobs lwfm ids which obviates collisions between 
 # job sites.  Other objects in the system may also use this generator.
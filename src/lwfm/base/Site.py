@@ -21,6 +21,7 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 import os
 from typing import List
+import functools
 import importlib
 
 from lwfm.base.LwfmBase import LwfmBase
@@ -36,6 +37,15 @@ class SitePillar(ABC):
     pass
 
 
+class JobNotFoundException(Exception):
+    """
+    Raised by a Site's Run.getStatus() when the Site has no record of the job.
+    The lwfm middleware takes it to mean a remote job it is polling is gone, 
+    and retires the job's handler.
+    """
+    pass
+
+
 # ***************************************************************************
 
 class SiteAuth(SitePillar):
@@ -103,18 +113,6 @@ class SiteRun(SitePillar):
     canonical name set by the implementation of the Site.Run itself.
     """
 
-    @classmethod
-    def _submitJob(cls, jobDefn, parentContext=None, computeType=None, runArgs=None):
-        """
-        This helper function, not a member of the public interface, lets Python
-        threading instantiate a SiteRunDriver of the correct subtype on demand.
-        It is used, for example, by the lwfm middleware's event handler mechanism
-        to reflectively instantiate a Site Run driver of the correct subtype,
-        and then call its submitJob() method.
-        """
-        runDriver = cls()
-        runDriver.submit(jobDefn, parentContext)
-
     @abstractmethod
     def submit(self, jobDefn: JobDefn, parentContext: JobContext = None, 
         computeType: str = None, runArgs: dict = None) -> JobStatus:
@@ -163,6 +161,8 @@ class SiteRun(SitePillar):
                 job id
         Returns:
             JobStatus - the current known status of the job
+        Raises:
+            JobNotFoundException - the Site has no record of the job
         """
         pass
 
@@ -273,20 +273,34 @@ class Site(LwfmBase):
     # implements Auth, Run, Repo, [Spin]  these mappings can be extended in 
     # the ~/.lwfm/sites.txt configuration
     _SITES = {"local": "lwfm.sites.LocalSite.LocalSite", 
-              "insitu": "lwfm.sites.InSituSite.InSituSite",
+              "insitu": "lwfm.sites.LocalSite.InSituSite",
               "ibm_quantum": "lwfm.sites.IBMQuantumSite.IBMQuantumSite"}
+    _SITES_FILE = os.path.join(os.path.expanduser("~"), ".lwfm", "sites.txt")
+
+    # the merged site map, and the mtime of the sites.txt it was built from 
+    # (None when there is no such file)
+    _siteConfig: dict = None
+    _siteConfigKey = None
 
     @staticmethod
-    def _getSiteEntry(site: str):
-        siteSet = Site._SITES
+    def _getSiteConfig() -> dict:
         # is there a local site config?
-        path = os.path.expanduser("~") + "/.lwfm/sites.txt"
-        # Check whether the specified path exists or not
-        if os.path.exists(path):
+        path = Site._SITES_FILE
+        try:
+            key = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            key = None
+        # re-read only when the file has changed since we last parsed it
+        if (Site._siteConfig is not None) and (key == Site._siteConfigKey):
+            return Site._siteConfig
+        siteSet = dict(Site._SITES)
+        if (key is not None):
             Logger.info("Loading custom site configs from ~/.lwfm/sites.txt")
             with open(path) as f:
                 for line in f:
-                    name, var = line.split("=")
+                    name, sep, var = line.partition("=")
+                    if (not sep):
+                        continue    # blank or malformed line
                     name = name.strip()
                     var = var.strip()
                     Logger.info(
@@ -297,22 +311,40 @@ class Site(LwfmBase):
             Logger.info(
                 "No custom ~/.lwfm/sites.txt - using built-in site configs"
             )
-        fullPath = siteSet[site]
+        Site._siteConfig = siteSet
+        Site._siteConfigKey = key
+        return siteSet
+
+    @staticmethod
+    def _getSiteEntry(site: str):
+        siteSet = Site._getSiteConfig()
+        return Site._resolveSiteEntry(site, Site._siteConfigKey, siteSet[site])
+
+    # resolved once per site for a given version of the site config - the 
+    # config key in the signature invalidates entries when sites.txt changes
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _resolveSiteEntry(site: str, configKey, fullPath: str):
         Logger.info("Obtaining site driver " + fullPath + " for " + site)
         if fullPath is not None:
             # parse the path into package and class parts for convenience
-            xPackage = fullPath.rsplit(".", 1)[0]
-            xClass = fullPath.rsplit(".", 1)[1]
-            return [xPackage, xClass]
+            xPackage, _, xClass = fullPath.rpartition(".")
+            return (xPackage, xClass)
         else:
             return None
 
+    # driver classes, once imported, by package and class name
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _getSiteClass(xPackage: str, xClass: str) -> type:
+        module = importlib.import_module(xPackage)
+        return getattr(module, xClass)
+
     @staticmethod
     def getSite(site: str = "local"):
         try:
             entry = Site._getSiteEntry(site)
-            module = importlib.import_module(entry[0])
-            class_ = getattr(module, str(entry[1]))
+            class_ = Site._getSiteClass(*entry)
             inst = class_()
             inst.setName(site)
             return inst
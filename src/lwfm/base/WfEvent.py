@@ -7,12 +7,17 @@
 # in these cases, a user-provided handler is fired
 
 from enum import Enum
+import re
 
 from lwfm.base.LwfmBase import LwfmBase
 from lwfm.base.JobDefn import JobDefn
 from lwfm.base.JobContext import JobContext
 
 
+# a query value with none of these in it is a plain substring, not a regex
+_REGEX_META = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
 # ************************************************************************
 class _WfEventFields(Enum):
     FIRE_DEFN = "fireDefn"
@@ -45,9 +50,9 @@ class WfEvent(LwfmBase):
         return LwfmBase._getArg(self, _WfEventFields.FIRE_JOB_ID.value)
 
     def __str__(self):
-        return f"[event defn:{str(self.getFireDefn())} " + \
-            f"site:{str(self.getFireSite())} " + \
-            f"jobId:{str(self.getFireJobId())}]"
+        return (f"[event defn:{self.getFireDefn()} "
+                f"site:{self.getFireSite()} "
+                f"jobId:{self.getFireJobId()}]")
 
     def getKey(self) -> str:
         return self.getId()
@@ -110,7 +115,7 @@ class JobEvent(WfEvent):
         return LwfmBase._getArg(self, _JobEventFields.RULE_STATUS.value)
 
     def getKey(self) -> str:
-        return str("" + self.getRuleJobId() + "." + str(self.getRuleStatus()))
+        return f"{self.getRuleJobId()}.{self.getRuleStatus()}"
 
     @staticmethod
     def getJobEventKey(jobId: str, status: Enum) -> str:
@@ -126,12 +131,25 @@ class _MetadataEventFields(Enum):
 
 
 class MetadataEvent(WfEvent):
+    _queryPatterns: dict = None     # compiled queryRegExs, built on first use
+
     def __init__(self, queryRegExs: dict, fireDefn: JobDefn, fireSite: str):
         super(MetadataEvent, self).__init__(fireDefn, fireSite)
         LwfmBase._setArg(self, _MetadataEventFields.QUERY_REG_EXS.value, queryRegExs)  
 
     def getQueryRegExs(self) -> dict:
         return LwfmBase._getArg(self, _MetadataEventFields.QUERY_REG_EXS.value)
+
+    # the query regexes compiled once - they are pickled along with the event, 
+    # so a handler compiled at registration is not re-parsed on every check.
+    # A value with no regex syntax in it stays a str, to be matched as a 
+    # substring without the regex engine.
+    def getQueryPatterns(self) -> dict:
+        if (self._queryPatterns is None):
+            self._queryPatterns = {
+                k: (v if not _REGEX_META.search(v) else re.compile(v)) 
+                for (k, v) in self.getQueryRegExs().items()}
+        return self._queryPatterns
     
     def __str__(self):
         return super().__str__() + \
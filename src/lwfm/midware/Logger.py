@@ -4,8 +4,12 @@ offering simplified logging methods with optional JobContext integration.
 It persists to the lwfm store.
 """
 
+import atexit
 import logging
-import datetime
+import os
+import queue
+import threading
+import time
 
 from lwfm.midware.impl.LwfmEventClient import LwfmEventClient
 
@@ -13,6 +17,10 @@ from lwfm.midware.impl.LwfmEventClient import LwfmEventClient
 class Logger:
     _logger = None
     _lwfmClient = None
+    _queue = None
+    _emitterPid = None
+    # the second last formatted, and its text 
+    _timestamp = (None, None)
 
     # create a singleton logger
     def __init__(self):
@@ -20,11 +28,47 @@ class Logger:
         self._logger = logging.getLogger()
         self._logger.setLevel(logging.INFO)
         self._lwfmClient = LwfmEventClient()
+        self._emitterLock = threading.Lock()
+        atexit.register(self.flush)
 
+    # records are sent to the lwfm service from a background thread, in order,
+    # so a log call doesn't wait on an HTTP round trip.  A forked child starts 
+    # its own thread.
+    def _emit(self, level: str, out: str) -> None:
+        pid = os.getpid()
+        if (self._emitterPid != pid):
+            with self._emitterLock:
+                if (self._emitterPid != pid):
+                    self._queue = queue.SimpleQueue()
+                    threading.Thread(target=self._runEmitter, args=(self._queue,), 
+                                     name="lwfm-log-emit", daemon=True).start()
+                    self._emitterPid = pid
+        self._queue.put((level, out))
+
+    def _runEmitter(self, q: queue.SimpleQueue) -> None:
+        while True:
+            (level, out) = q.get()
+            if (level is None):
+                out.set()       # a flush marker 
+            else:
+                self._lwfmClient.emitLogging(level, out)
+
+    # wait for the records logged so far to be sent 
+    def flush(self, timeout: float = 5) -> None:
+        if (self._emitterPid != os.getpid()):
+            return
+        done = threading.Event()
+        self._queue.put((None, done))
+        done.wait(timeout)
+
+    # the stamp has a resolution of a second - format it once per second 
     def _getTimestamp(self) -> str:
-        current_time = datetime.datetime.now(datetime.timezone.utc)
-        formatted_time = current_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        return formatted_time
+        now = int(time.time())
+        (second, text) = self._timestamp
+        if (second != now):
+            text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+            self._timestamp = (now, text)
+        return text
 
     def _buildMsg(self, msg: str, status: str) -> str:
         if (status is None):
@@ -44,12 +88,12 @@ class Logger:
     def info(self, msg: str, status: str = None) -> None:
         out = self._buildMsg(msg, status)
         self._logger.info(out)
-        self._lwfmClient.emitLogging("INFO", out)
+        self._emit("INFO", out)
 
     def error(self, msg: str, status: str = None) -> None:
         out = self._buildMsg(msg, status)
         self._logger.error(out)
-        self._lwfmClient.emitLogging("ERROR", out)
+        self._emit("ERROR", out)
 
 
 
@@ -111,7 +111,7 @@ class LwfManager():
         args['siteObjPath'] = siteObjPath
         metasheet.setArgs(args)
         # persist 
-        sheet = LwfmEventClient().notate(metasheet.getId(), metasheet)
+        sheet = self._client.notate(metasheet.getId(), metasheet)
         # now emit an INFO job status
         self.emitRepoInfo(jobContext, metasheet)   
         return sheet
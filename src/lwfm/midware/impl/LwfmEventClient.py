@@ -5,10 +5,10 @@
 
 import json
 from pathlib import Path
-import requests
-from typing import List
+from typing import List, TYPE_CHECKING
 import os 
 import datetime
+import threading
 import logging    # don't use the lwfm Logger here else circular import
 
 from lwfm.base.JobStatus import JobStatus
@@ -16,19 +16,42 @@ from lwfm.base.JobContext import JobContext
 from lwfm.base.Metasheet import Metasheet
 from lwfm.base.WfEvent import WfEvent
 
+# requests - most of the cost of importing lwfm - is imported when the first 
+# call to the service is made
+if TYPE_CHECKING:
+    import requests
+
 class LwfmEventClient():
+    # serialized objects are posted as raw pickle bytes
+    _BINARY_HEADERS = {"Content-Type": "application/octet-stream"}
+
     _SERVICE_URL = "http://127.0.0.1:3000"
     if os.getenv("LWFM_SERVICE_URL") is not None:
         _SERVICE_URL = os.getenv("LWFM_SERVICE_URL")    
 
+    # one keep-alive connection pool per thread - a requests.Session is not 
+    # thread safe, and the logger's emitter, the site waiters and the event
+    # processor's pools all call the service - and a forked child must not 
+    # share its parent's sockets
+    _local = threading.local()
+
     def getUrl(self):
         return self._SERVICE_URL
 
+    def _getSession(self) -> "requests.Session":
+        local = LwfmEventClient._local
+        pid = os.getpid()
+        if (getattr(local, "pid", None) != pid):
+            import requests
+            local.session = requests.Session()
+            local.pid = pid
+        return local.session
+
     #***********************************************************************
     # status methods
 
     def getStatus(self, jobId: str) -> JobStatus:
-        response = requests.get(f"{self.getUrl()}/status/{jobId}")
+        response = self._getSession().get(f"{self.getUrl()}/status/{jobId}")
         try:
             if response.ok:
                 if (response.text is not None) and (len(response.text) > 0):
@@ -53,9 +76,9 @@ class LwfmEventClient():
             status.setNativeStatus(nativeStatus)    
             status.setNativeInfo(nativeInfo)
             status.setEmitTime(datetime.datetime.now(datetime.UTC))
-            statusBlob = status.serialize()
-            data = {"statusBlob": statusBlob}
-            response = requests.post(f"{self.getUrl()}/emitStatus", data=data)
+            response = self._getSession().post(f"{self.getUrl()}/emitStatus", 
+                                     data=status.serializeBytes(), 
+                                     headers=self._BINARY_HEADERS)
             if response.ok:
                 return
             else:
@@ -69,9 +92,9 @@ class LwfmEventClient():
     # event methods
 
     def setEvent(self, wfe: WfEvent) -> str:
-        payload = {}
-        payload["eventObj"] = wfe.serialize()
-        response = requests.post(f"{self.getUrl()}/setEvent", payload)
+        response = self._getSession().post(f"{self.getUrl()}/setEvent", 
+                                 data=wfe.serializeBytes(), 
+                                 headers=self._BINARY_HEADERS)
         if response.ok:
             # return the job id of the registered job
             return response.text
@@ -82,7 +105,7 @@ class LwfmEventClient():
     def unsetEvent(self, wfe: WfEvent) -> None:
         payload = {}
         payload["eventObj"] = wfe.serialize()
-        response = requests.post(f"{self.getUrl()}/unsetEvent", payload)
+        response = self._getSession().post(f"{self.getUrl()}/unsetEvent", payload)
         if response.ok:
             # return the job id of the registered job
             return 
@@ -91,7 +114,7 @@ class LwfmEventClient():
             return 
 
     def getActiveWfEvents(self) -> List[WfEvent]:
-        response = requests.get(f"{self.getUrl()}/listEvents")
+        response = self._getSession().get(f"{self.getUrl()}/listEvents")
         if response.ok:
             l = json.loads(response.text)
             return [WfEvent.deserialize(blob) for blob in l]
@@ -107,7 +130,7 @@ class LwfmEventClient():
         try:
             data = {"level": level, 
                     "errorMsg": doc}
-            response = requests.post(f"{self.getUrl()}/emitLogging", data)
+            response = self._getSession().post(f"{self.getUrl()}/emitLogging", json=data)
             if response.ok:
                 return
             else:
@@ -126,9 +149,9 @@ class LwfmEventClient():
     def notate(self, jobId: str, metasheet: Metasheet = None) -> Metasheet:
         # call to the service to put metasheet for this put 
         try:
-            data = {"jobId": jobId, 
-                    "data": metasheet.serialize()}
-            response = requests.post(f"{self.getUrl()}/notate", data)
+            response = self._getSession().post(f"{self.getUrl()}/notate", 
+                                     data=metasheet.serializeBytes(), 
+                                     headers=self._BINARY_HEADERS)
             if response.ok:
                 return
             else:
@@ -143,8 +166,7 @@ class LwfmEventClient():
     def find(self, queryRegExs: dict) -> List[Metasheet]:
         # call to the service to find metasheets
         try:
-            data = {"searchDict": json.dumps(queryRegExs)}
-            response = requests.post(f"{self.getUrl()}/find", data)
+            response = self._getSession().post(f"{self.getUrl()}/find", json=queryRegExs)
             if response.ok:
                 l = json.loads(response.text)
                 return [Metasheet.deserialize(blob) for blob in l]
@@ -3,134 +3,297 @@
 # The Event Processor watches for Job Status events and fires a JobDefn 
 # to a Site when an event of interest occurs.
 
-import re
+import datetime
+import os
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+from lwfm.base.LwfmBase import LwfmBase
 from lwfm.base.JobStatus import JobStatus, JobStatusValues
 from lwfm.base.JobContext import JobContext
 from lwfm.base.WfEvent import RemoteJobEvent, WfEvent, JobEvent, MetadataEvent
-from lwfm.base.Site import Site
-from lwfm.midware.impl.Store import EventStore, JobStatusStore, LoggingStore
-from lwfm.midware.LwfManager import LwfManager
+from lwfm.base.Site import Site, JobNotFoundException
+from lwfm.midware.impl.Store import EventStore, JobStatusStore, LoggingStore, \
+    BufferedLoggingStore
 
 # ***************************************************************************
 
 class LwfmEventProcessor:
-    _timer = None
-    _eventHandlerMap = dict()
-
-    _infoQueue: List[JobStatus] = []
-    _eventStore: EventStore = None
-    _jobStatusStore: JobStatusStore = None
-    _loggingStore: LoggingStore = None
-
+    # instance state only - the processor is long lived and shared, so keep 
+    # mutable defaults off the class
+    __slots__ = (
+        "_eventStore", "_jobStatusStore", "_loggingStore", "_siteCache",
+        "_fireExecutor", "_remoteProbeExecutor",
+        "_dataEventsById", "_dataEventsByKey", "_dataEventLock",
+        "_statusCheckIntervalSeconds", "_eventCount", "_eventCountLock",
+        "_jobRules",
+        "_pollThread", "_wakeEvent", "_stopEvent", "_initialized",
+        "_dataQueue", "_dataThread",
+    )
+
+    # the processor is a per-process singleton
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    _eventStore: EventStore
+    _jobStatusStore: JobStatusStore
+    _loggingStore: LoggingStore
+    _siteCache: dict
+    _fireExecutor: ThreadPoolExecutor
+    _remoteProbeExecutor: ThreadPoolExecutor
+
+    # in-memory index of the DATA handlers - id -> event, and query key -> ids -
+    # loaded lazily from the event store and kept current on set/unset
+    _dataEventsById: dict
+    _dataEventsByKey: dict
+    _dataEventLock: threading.Lock
+
+    # the polling interval resets to MIN when busy and doubles on each idle 
+    # tick up to MAX
     STATUS_CHECK_INTERVAL_SECONDS_MIN = 5
     STATUS_CHECK_INTERVAL_SECONDS_MAX = 5*60
-    STATUS_CHECK_INTERVAL_SECONDS_STEP = 5
-    _statusCheckIntervalSeconds = STATUS_CHECK_INTERVAL_SECONDS_MIN
+    _statusCheckIntervalSeconds: int
+
+    # the handler types polled on each tick, and how many of them are registered
+    _POLLED_EVENT_TYPES = ("run.event.JOB", "run.event.REMOTE")
+    _WAKE_COALESCE_SECONDS = 0.005
+    _eventCount: int
+    _eventCountLock: threading.Lock
+    # the (rule job id, rule status) pairs the JOB handlers wait on - the 
+    # statuses worth waking the poller for
+    _jobRules: frozenset
+
+    # INFO statuses waiting to be tested against the data handlers, and the 
+    # thread which tests them
+    _DATA_QUEUE_SIZE = 10000
+    _dataQueue: queue.Queue
+    _dataThread: threading.Thread
+
+    _pollThread: threading.Thread
+    _wakeEvent: threading.Event
+    _stopEvent: threading.Event
+
+    def __new__(cls):
+        # double-checked - after the first construction this is a plain read
+        instance = cls._instance
+        if (instance is not None):
+            return instance
+        with cls._instanceLock:
+            if (cls._instance is None):
+                cls._instance = super(LwfmEventProcessor, cls).__new__(cls)
+            return cls._instance
+
+    @classmethod
+    def getInstance(cls) -> "LwfmEventProcessor":
+        instance = cls._instance
+        if (instance is not None) and (getattr(instance, "_initialized", False)):
+            return instance
+        return cls()
 
     def __init__(self):
-        self._eventStore = EventStore()
-        self._jobStatusStore = JobStatusStore()
-        self._loggingStore = LoggingStore()
-        self._timer = threading.Timer(
-            self._statusCheckIntervalSeconds,
-            LwfmEventProcessor.checkEventHandlers,
-            (self,),
-        )
-        self._timer.start()
+        if (getattr(self, "_initialized", False)):
+            return
+        with self._instanceLock:
+            if (getattr(self, "_initialized", False)):
+                return
+            self._eventStore = EventStore()
+            self._jobStatusStore = JobStatusStore()
+            self._loggingStore = BufferedLoggingStore.getInstance()
+            self._siteCache = {}
+            self._dataEventsById = None
+            self._dataEventsByKey = None
+            self._dataEventLock = threading.Lock()
+            self._statusCheckIntervalSeconds = self.STATUS_CHECK_INTERVAL_SECONDS_MIN
+            self._eventCount = 0
+            self._eventCountLock = threading.Lock()
+            self._jobRules = frozenset()
+            self._refreshEventCount()
+            # fired jobs are submitted on a bounded pool so a burst of triggers 
+            # neither blocks the polling thread nor spawns a thread per fire
+            self._fireExecutor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("LWFM_FIRE_WORKERS", "8")),
+                thread_name_prefix="lwfm-fire",
+            )
+            # remote status probes are network bound - overlap them within a tick
+            self._remoteProbeExecutor = ThreadPoolExecutor(
+                max_workers=16, thread_name_prefix="lwfm-remote",
+            )
+            # one long-lived polling thread; it sleeps on an event so a wake() 
+            # can cut the current interval short
+            self._wakeEvent = threading.Event()
+            self._stopEvent = threading.Event()
+            self._pollThread = threading.Thread(target=self._pollLoop, 
+                                                name="lwfm-poll", daemon=True)
+            self._pollThread.start()
+            self._dataQueue = queue.Queue(maxsize=self._DATA_QUEUE_SIZE)
+            self._dataThread = threading.Thread(target=self._dataLoop, 
+                                                name="lwfm-data", daemon=True)
+            self._dataThread.start()
+            self._initialized = True
+
+
+    def _pollLoop(self) -> None:
+        while True:
+            if (self._wakeEvent.wait(self._statusCheckIntervalSeconds)):
+                # woken early - let the rest of a burst of wakes land so they 
+                # are served by the one pass
+                self._stopEvent.wait(self._WAKE_COALESCE_SECONDS)
+            self._wakeEvent.clear()
+            if (self._stopEvent.is_set()):
+                return
+            try:
+                self.checkEventHandlers()
+            except Exception as ex:
+                self._loggingStore.putLogging("ERROR", "Exception polling events: " + str(ex))
+
+
+    def _dataLoop(self) -> None:
+        while True:
+            status = self._dataQueue.get()
+            if (status is None) or (self._stopEvent.is_set()):
+                return
+            self.checkDataEvents(status)
+
+
+    # test an INFO status against the data handlers in the background, so the
+    # caller - a status post - needn't wait on it; inline if the queue is full
+    def queueDataEvents(self, status: JobStatus) -> None:
+        try:
+            self._dataQueue.put_nowait(status)
+        except queue.Full:
+            self._loggingStore.putLogging("WARN", "data trigger queue full, checking inline")
+            self.checkDataEvents(status)
+
+
+    # poll now and from the shortest interval - Event.set() is idempotent, so
+    # concurrent callers collapse into at most one extra pass
+    def wake(self) -> None:
+        self._statusCheckIntervalSeconds = self.STATUS_CHECK_INTERVAL_SECONDS_MIN
+        self._wakeEvent.set()
+
+
+    # a job status was stored - if it satisfies a job handler, poll soon rather
+    # than on the backed-off interval.  Statuses of other jobs, remote ones 
+    # included - a remote probe emits its own - leave the back-off alone.
+    def wakeForStatus(self, status: JobStatus) -> None:
+        if ((status.getJobId(), status.getStatusValue()) in self._jobRules):
+            self.wake()
+
+
+    # site drivers are effectively immutable for the life of the service, so
+    # resolve each one once rather than on every fired or polled event
+    def _getSite(self, siteName: str) -> Site:
+        site = self._siteCache.get(siteName)
+        if (site is None):
+            site = Site.getSite(siteName)
+            if (site is not None):
+                self._siteCache[siteName] = site
+        return site
 
 
     def _runAsyncOnSite(self, trigger: WfEvent, context: JobContext) -> None:
-        site = Site.getSite(trigger.getFireSite())
-        runDriver = site.getRun().__class__
-        # Note: Comma is needed at end to make this a tuple. DO NOT REMOVE
-        thread = threading.Thread(
-            target=runDriver._submitJob,
-             args=(
-                trigger.getFireDefn(),
-                context,
-                ),
-            )
-        thread.start()
+        # the site's run driver is shared rather than one built per fired job 
+        site = self._getSite(trigger.getFireSite())
+        self._fireExecutor.submit(site.getRun().submit, trigger.getFireDefn(), context)
 
     
-    def _makeJobContext(self, trigger: JobEvent, parentContext: JobContext) -> JobContext:
+    # the context of the job fired by a trigger - a child of the job whose 
+    # status satisfied it, with the id reserved when the handler was set
+    def _makeFireContext(self, trigger: WfEvent, parentContext: JobContext) -> JobContext:
         newJobContext = JobContext(parentContext)
         newJobContext.setSiteName(trigger.getFireSite())
         newJobContext.setId(trigger.getFireJobId())
         newJobContext.setNativeId(trigger.getFireJobId()) 
         return newJobContext
 
-    def _makeDataContext(self, trigger: MetadataEvent, infoContext: JobContext) -> JobContext:
-        newJobContext = JobContext(infoContext)
-        newJobContext.setSiteName(trigger.getFireSite())
-        newJobContext.setId(trigger.getFireJobId())
-        newJobContext.setNativeId(trigger.getFireJobId())
-        newJobContext.setParentJobId(infoContext.getJobId())
-        newJobContext.setOriginJobId(infoContext.getOriginJobId())
-        return newJobContext
+
+    # fire the satisfied handlers, each a (trigger, parent context) pair - the 
+    # handlers are removed, in one store write, before any job is launched so 
+    # each can only fire once
+    def _fireEvents(self, fired: List[tuple]) -> None:
+        if (not fired):
+            return
+        self.unsetEventHandlers([trigger.getId() for (trigger, _) in fired])
+        for (trigger, parentContext) in fired:
+            self._runAsyncOnSite(trigger, self._makeFireContext(trigger, parentContext))
+
+
+
+
+    # returns (probed ok, handler done)
+    def _probeRemoteJobEvent(self, e: RemoteJobEvent) -> tuple:
+        try:
+            self._loggingStore.putLogging("INFO", 
+                f"remote id:{e.getFireJobId()} native:{e.getNativeJobId()} site:{e.getFireSite()}")
+            # ask the remote site to inquire status
+            site = self._getSite(e.getFireSite())
+            status = site.getRun().getStatus(e.getFireJobId())   # canonical job id
+            # a terminal remote job is done and its handler can be retired 
+            return (True, status.isTerminal())
+        except JobNotFoundException:
+            # the site doesn't know the job.  Anything else - a driver's own 
+            # bug included - is an error, and the handler keeps polling.
+            self._loggingStore.putLogging("INFO", 
+                f"remote id:{e.getFireJobId()} not found on site:{e.getFireSite()}")
+            return (True, True)
+        except Exception as ex1:
+            self._loggingStore.putLogging("ERROR", "Exception checking remote job event: " + str(ex1))
+            return (False, False)
 
 
     # monitor remote jobs until they reach terminal states
-    def checkRemoteJobEvents(self) -> bool:
+    def checkRemoteJobEvents(self, events: List[RemoteJobEvent]) -> bool:
         gotOne = False
         try:
-            events: List[RemoteJobEvent] = self.findAllEvents("run.event.REMOTE")
-            for e in events:
-                try:
-                    self._loggingStore.putLogging("INFO", 
-                        f"remote id:{e.getFireJobId()} native:{e.getNativeJobId()} site:{e.getFireSite()}")
-                    # ask the remote site to inquire status
-                    site = Site.getSite(e.getFireSite())
-                    status = site.getRun().getStatus(e.getFireJobId())   # canonical job id
-                    if (status.isTerminal()):
-                        # remote job is done
-                        self.unsetEventHandler(e.getId())
-                    gotOne = True
-                except Exception as ex1:
-                    self._loggingStore.putLogging("ERROR", "Exception checking remote job event: " + str(ex1))
+            # each probe is a round-trip to its site - run them concurrently 
+            futures = [self._remoteProbeExecutor.submit(self._probeRemoteJobEvent, e) 
+                       for e in events]
+            results = [f.result() for f in futures]
+            gotOne = any([ok for (ok, _) in results])
+            self.unsetEventHandlers([e.getId() for (e, (_, done)) in zip(events, results) 
+                                     if done])
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", "Exception checking remote pollers: " + str(ex)) 
         return gotOne
 
 
-    def checkJobEvent(self, jobEvent: JobEvent) -> JobStatus:
+    # statusCache, if given, memoizes the lookup per rule job id and status so 
+    # many handlers waiting on the same upstream job cost one store query 
+    def checkJobEvent(self, jobEvent: JobEvent, statusCache: dict = None) -> JobStatus:
         try:
-            statuses = self._jobStatusStore.getAllJobStatuses(jobEvent.getRuleJobId())
-            # the statuses will be in reverse chron order  
+            cacheKey = (jobEvent.getRuleJobId(), jobEvent.getRuleStatus())
+            if (statusCache is not None) and (cacheKey in statusCache):
+                return statusCache[cacheKey]
             # does the history contain the state we want to fire on?
-            for s in statuses:
-                if (s.getStatus().value == jobEvent.getRuleStatus()):
-                    return s
-            return None
+            status = self._jobStatusStore.findJobStatus(*cacheKey)
+            if (statusCache is not None):
+                statusCache[cacheKey] = status
+            return status
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", 
                                           "Exception checking job event: " + jobEvent.getRuleJobId() + " " + str(ex)) 
 
 
-    def checkJobEvents(self) -> bool:
+    def checkJobEvents(self, events: List[JobEvent]) -> bool:
         gotOne = False
         try:
-            events = self.findAllEvents("run.event.JOB")
-            if (len(events) > 0):
-                print("Job events: " + str(len(events)))
-            else:
+            if (len(events) == 0):
                 return False
+            # job status lookups made this tick
+            statusCache = {}
+            fired = []
             for e in events:
                 try: 
-                    status = self.checkJobEvent(e)
+                    status = self.checkJobEvent(e, statusCache)
                     if (status):
-                        # job event satisfied - going to fire the handler 
-                        # but first, remove the handler 
-                        self.unsetEventHandler(e.getId())
-                        # now launch it async 
-                        self._runAsyncOnSite(e, self._makeJobContext(e, status.getJobContext()))
-                        gotOne = True
+                        fired.append((e, status.getJobContext()))
                 except Exception as ex1:
                     self._loggingStore.putLogging("ERROR", 
                                                   "Exception checking job event: " + str(ex1))
+            self._fireEvents(fired)
+            gotOne = len(fired) > 0
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", "Exception checking job events: " + str(ex)) 
         return gotOne
@@ -141,67 +304,130 @@ class LwfmEventProcessor:
             return False
         if (jobStatus is None):
             return False
-        if (jobStatus.getNativeInfo() is None):
+        # the native info of a data INFO status is the metasheet - anything 
+        # else (e.g. a plain string) can't satisfy a data trigger
+        info = jobStatus.getNativeInfo()
+        if not isinstance(info, LwfmBase):
             return False
-        if (jobStatus.getNativeInfo().getArgs() is None):
+        args = info.getArgs()
+        if (args is None):
             return False
-        for key in dataEvent.getQueryRegExs().keys():
-            if (key in jobStatus.getNativeInfo().getArgs().keys()):
-                keyVal = dataEvent.getQueryRegExs()[key]
-                statVal = jobStatus.getNativeInfo().getArgs()[key]
-                # the key val might have wildcards in it
-                if not (re.search(keyVal, statVal)):
+        for (key, pattern) in dataEvent.getQueryPatterns().items():
+            if (key in args):
+                statVal = args[key]
+                # the key val might have wildcards in it - else it's a plain
+                # substring
+                if (type(pattern) is str):
+                    if (pattern not in statVal):
+                        return False
+                elif not (pattern.search(statVal)):
                     return False
             else:
                 return False
         return True
 
 
+    def _loadDataEventIndex(self) -> None:
+        if (self._dataEventsById is not None):
+            return
+        self._dataEventsById = {}
+        self._dataEventsByKey = {}
+        for e in self.findAllEvents("run.event.DATA") or []:
+            self._indexDataEvent(e)
+
+
+    def _indexDataEvent(self, e: MetadataEvent) -> None:
+        self._dataEventsById[e.getId()] = e
+        for key in e.getQueryRegExs().keys():
+            self._dataEventsByKey.setdefault(key, set()).add(e.getId())
+
+
+    # drop a handler from the index, returning it if it was present 
+    def _unindexDataEvent(self, eventId: str) -> MetadataEvent:
+        with self._dataEventLock:
+            if (self._dataEventsById is None):
+                return None
+            e = self._dataEventsById.pop(eventId, None)
+            if (e is not None):
+                for key in e.getQueryRegExs().keys():
+                    ids = self._dataEventsByKey.get(key)
+                    if (ids is not None):
+                        ids.discard(eventId)
+                        if (not ids):
+                            del self._dataEventsByKey[key]
+            return e
+
+
+    # the DATA handlers which reference at least one of the given metadata keys - 
+    # a handler needs all its keys present to match, so the rest can't fire
+    def _findDataEventCandidates(self, keys) -> List[MetadataEvent]:
+        with self._dataEventLock:
+            self._loadDataEventIndex()
+            ids = set()
+            for key in keys:
+                ids.update(self._dataEventsByKey.get(key, ()))
+            return [self._dataEventsById[eventId] for eventId in ids]
+
+
     # the provided INFO status message was just emitted - are there any data 
     # triggers waiting on its content?
     def checkDataEvents(self, status: JobStatus) -> bool:
         gotOne = False
         try:
-            events = self.findAllEvents("run.event.DATA")
-            print("Data events: " + str(len(events)))
+            info = status.getNativeInfo()
+            if not isinstance(info, LwfmBase) or (info.getArgs() is None):
+                return False
+            events = self._findDataEventCandidates(info.getArgs().keys())
+            fired = []
             for e in events:
                 try: 
-                    if (self.checkDataEvent(e, status)):
+                    # claiming the handler from the index first keeps two 
+                    # concurrent statuses from firing it twice
+                    if (self.checkDataEvent(e, status)) and \
+                        (self._unindexDataEvent(e.getId()) is not None):
                         self._loggingStore.putLogging("INFO", 
                             f"data triggered id:{e.getFireJobId()} on site:{e.getFireSite()}")
-                        # event satisfied - going to fire the handler 
-                        # but first, remove the handler 
-                        self.unsetEventHandler(e.getId())
-                        # now launch it async 
-                        self._runAsyncOnSite(e, self._makeDataContext(e, status.getJobContext()))
-                        gotOne = True
+                        fired.append((e, status.getJobContext()))
                 except Exception as ex1:
                     self._loggingStore.putLogging("ERROR", 
                                                   "Exception checking data event: " + str(ex1))
+            self._fireEvents(fired)
+            gotOne = len(fired) > 0
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", "Exception checking data events: " + str(ex)) 
         return gotOne
 
 
+    # the store is the truth - recount rather than increment/decrement so an 
+    # unset of an unknown id can't drift the count
+    def _refreshEventCount(self) -> None:
+        try:
+            with self._eventCountLock:
+                self._eventCount = self._eventStore.countWfEvents(self._POLLED_EVENT_TYPES)
+                self._jobRules = frozenset(
+                    (e.getRuleJobId(), e.getRuleStatus()) 
+                    for e in self._eventStore.iterWfEvents("run.event.JOB"))
+        except Exception as ex:
+            self._loggingStore.putLogging("ERROR", "_refreshEventCount: " + str(ex))
+
+
     def checkEventHandlers(self):
-        c1 = self.checkJobEvents()
-        c2 = self.checkRemoteJobEvents()
+        c1 = False
+        c2 = False
+        # when nothing is registered, an idle tick doesn't touch the store
+        if (self._eventCount > 0):
+            # one read of the event store per tick, dispatched by type
+            buckets = self.findAllEventsByType(self._POLLED_EVENT_TYPES)
+            c1 = self.checkJobEvents(buckets["run.event.JOB"])
+            c2 = self.checkRemoteJobEvents(buckets["run.event.REMOTE"])
 
         # we were busy, reduce the polling interval
         if (c1) or (c2): 
             self._statusCheckIntervalSeconds = self.STATUS_CHECK_INTERVAL_SECONDS_MIN
         else:
-            # make the next polling progressively longer unless we were busy
-            if (self._statusCheckIntervalSeconds < self.STATUS_CHECK_INTERVAL_SECONDS_MAX):
-                self._statusCheckIntervalSeconds += self.STATUS_CHECK_INTERVAL_SECONDS_STEP
-
-        # Timers only run once, so re-trigger it
-        self._timer = threading.Timer(
-            self._statusCheckIntervalSeconds,
-            LwfmEventProcessor.checkEventHandlers,
-            (self,),
-        )
-        self._timer.start()
+            # make the next polling exponentially longer unless we were busy
+            self._statusCheckIntervalSeconds = min(self.STATUS_CHECK_INTERVAL_SECONDS_MAX, 
+                max(self.STATUS_CHECK_INTERVAL_SECONDS_MIN, self._statusCheckIntervalSeconds * 2))
 
 
     def _getOriginJobId(self, jobId: str) -> str:
@@ -211,6 +437,15 @@ class LwfmEventProcessor:
         return status.getJobContext().getOriginJobId()
 
 
+    # the processor lives in the service and owns a status store - record a 
+    # status directly rather than posting it back to our own endpoint
+    def _emitStatus(self, context: JobContext, statusValue: str) -> None:
+        status = JobStatus(context)
+        status.setNativeStatus(statusValue)
+        status.setEmitTime(datetime.datetime.now(datetime.UTC))
+        self._jobStatusStore.putJobStatus(status)
+
+
     def _initJobEventHandler(self, wfe: JobEvent) -> JobContext:
         # set the job context under which the new job will run, it will have a 
         # new id and be a child of the setting job
@@ -220,7 +455,7 @@ class LwfmEventProcessor:
         newJobContext.setParentJobId(wfe.getRuleJobId())
         newJobContext.setOriginJobId(self._getOriginJobId(wfe.getRuleJobId()))    
         # fire the initial status showing the new job ready on the shelf 
-        LwfManager.emitStatus(newJobContext, JobStatus, JobStatusValues.READY.value)
+        self._emitStatus(newJobContext, JobStatusValues.READY.value)
         return newJobContext
 
 
@@ -233,15 +468,32 @@ class LwfmEventProcessor:
         return newJobContext
 
     def _initMetadataJobHandler(self, wfe: MetadataEvent) -> JobContext:
+        wfe.getQueryPatterns()  # compile now, stored with the event
         newJobContext = JobContext()
         newJobContext.setSiteName(wfe.getFireSite())
         newJobContext.setParentJobId(None)  # we will know the parent & origin when the  
         newJobContext.setOriginJobId(None)  # metadata event occurs  
         # fire a status showing the new job ready on the shelf
-        LwfManager.emitStatus(newJobContext, JobStatus, JobStatusValues.READY.value)
+        self._emitStatus(newJobContext, JobStatusValues.READY.value)
         return newJobContext
 
 
+    # handler kinds: event class -> (init function, store type, whether the 
+    # fired job's id is reserved now) - subclasses resolve via their MRO 
+    _HANDLER_TABLE = {
+        JobEvent: (_initJobEventHandler, "JOB", True),
+        RemoteJobEvent: (_initRemoteJobHandler, "REMOTE", False),
+        MetadataEvent: (_initMetadataJobHandler, "DATA", True),
+    }
+
+    def _resolveHandler(self, wfe: WfEvent) -> tuple:
+        for cls in type(wfe).__mro__:
+            entry = self._HANDLER_TABLE.get(cls)
+            if (entry is not None):
+                return entry
+        return None
+
+
     def findAllEvents(self, typeT: str = None) -> List[WfEvent]:
         try:
             return self._eventStore.getAllWfEvents(typeT)
@@ -250,28 +502,36 @@ class LwfmEventProcessor:
             return None
 
 
+    def findAllEventsByType(self, typeTs: tuple) -> dict:
+        try:
+            return self._eventStore.getAllWfEventsByType(typeTs)
+        except Exception as ex:
+            self._loggingStore.putLogging("ERROR", "findAllEventsByType: " + str(ex))
+            return {typeT: [] for typeT in typeTs}
+
+
     # Register an event handler.  When a jobId running on a job Site
     # emits a particular Job Status, fire the given JobDefn (serialized) 
     # at the target Site.  Return the new job id.
     def setEventHandler(self, wfe: WfEvent) -> str:
-        typeT = ""
         try:
-            if isinstance(wfe, JobEvent):
-                context = self._initJobEventHandler(wfe)
-                wfe.setFireJobId(context.getId())
-                typeT = "JOB"
-            elif isinstance(wfe, RemoteJobEvent):
-                context = self._initRemoteJobHandler(wfe)
-                typeT = "REMOTE"
-            elif isinstance(wfe, MetadataEvent):
-                context = self._initMetadataJobHandler(wfe)
-                wfe.setFireJobId(context.getId())
-                typeT = "DATA"
-            else:
+            entry = self._HANDLER_TABLE.get(type(wfe)) or self._resolveHandler(wfe)
+            if (entry is None):
                 self._loggingStore.putLogging("ERROR", "setEventHandler: Unknown type")
                 return None
+            (initFn, typeT, setFireJobId) = entry
+            context = initFn(self, wfe)
+            if (setFireJobId):
+                wfe.setFireJobId(context.getId())
             # store the event handler 
             self._eventStore.putWfEvent(wfe, typeT)
+            if (typeT == "DATA"):
+                with self._dataEventLock:
+                    if (self._dataEventsById is not None):
+                        self._indexDataEvent(wfe)
+            else:
+                self._refreshEventCount()
+                self.wake()
             return context.getId()
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", "setEventHandler: " + str(ex))
@@ -279,8 +539,17 @@ class LwfmEventProcessor:
 
 
     def unsetEventHandler(self, handlerId: str) -> None:
+        self.unsetEventHandlers([handlerId])
+
+
+    def unsetEventHandlers(self, handlerIds: List[str]) -> None:
+        if (not handlerIds):
+            return
         try:
-            self._eventStore.deleteWfEvent(handlerId)
+            self._eventStore.deleteWfEvents(handlerIds)
+            unindexed = [self._unindexDataEvent(handlerId) for handlerId in handlerIds]
+            if (None in unindexed):
+                self._refreshEventCount()
             return 
         except Exception as ex:
             self._loggingStore.putLogging("ERROR", "unsetEventHandler: " + str(ex))
@@ -292,5 +561,19 @@ class LwfmEventProcessor:
 
     
     def exit(self):
-        self._timer.cancel()
+        self._stopEvent.set()
+        self._wakeEvent.set()
+        self._fireExecutor.shutdown(wait=False, cancel_futures=True)
+        self._remoteProbeExecutor.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._dataQueue.put_nowait(None)
+        except queue.Full:
+            pass    # the worker sees the stop event on its next item
+        self._dataThread.join(timeout=1)
+        # the logging store is shared with the rest of the process, which 
+        # closes it at exit
+        self._loggingStore.flush()
+        with self._instanceLock:
+            if (LwfmEventProcessor._instance is self):
+                LwfmEventProcessor._instance = None
 
@@ -3,12 +3,17 @@
 # Flask app service for the lwfm middleware
 
 import json
-from flask import Flask, request
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from flask import Flask, Response, request
 from lwfm.midware.impl.LwfmEventProcessor import LwfmEventProcessor
 from lwfm.base.JobStatus import JobStatus
 from lwfm.base.WfEvent import WfEvent
 from lwfm.base.Metasheet import Metasheet
-from lwfm.midware.impl.Store import JobStatusStore, LoggingStore, MetaRepoStore
+from lwfm.midware.impl.Store import JobStatusStore, BufferedLoggingStore, \
+    MetaRepoStore, EventStore, splitDefaultTable
 import logging
 
 #************************************************************************
@@ -18,15 +23,59 @@ app = Flask(__name__)
 app.logger.disabled = True
 log = logging.getLogger("werkzeug")
 log.setLevel(logging.ERROR)
-wfProcessor = LwfmEventProcessor()
+
+# the event processor - its store reads and threads - is started on first 
+# use rather than at import
+def _proc() -> LwfmEventProcessor:
+    return LwfmEventProcessor.getInstance()
+
 
 _statusStore = JobStatusStore()
-_loggingStore = LoggingStore()
+# clients log through the service line by line - write them in batches, 
+# through the same buffer as the event processor 
+_loggingStore = BufferedLoggingStore.getInstance()
 _metaStore = MetaRepoStore()
+_eventStore = EventStore()
 
 print("*** service starting")
 
 
+# objects are posted as a raw pickle body (application/octet-stream); older 
+# clients post the text serialization as a form field
+_OCTET_STREAM = "application/octet-stream"
+
+def _requestObj(cls: type, formKey: str):
+    if (request.mimetype == _OCTET_STREAM):
+        return cls.deserializeBytes(request.get_data(cache=False))
+    return cls.deserialize(request.form[formKey])
+
+
+# orjson when it is installed, else the standard library 
+if orjson is not None:
+    _jsonLoads = orjson.loads
+    def _jsonDumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _jsonLoads = json.loads
+    _jsonDumps = json.dumps
+
+
+# an empty list - the common answer to a poll - is a constant response 
+_EMPTY_LIST_RESPONSE = ("[]", 200, {"Content-Type": "application/json"})
+
+# list responses are a JSON array of serialized objects - emit it an element
+# at a time rather than building the whole body in memory first
+def _streamList(blobs) -> Response:
+    def generate():
+        sep = ""
+        yield "["
+        for blob in blobs:
+            yield sep + _jsonDumps(blob)
+            sep = ","
+        yield "]"
+    return Response(generate(), mimetype="application/json")
+
+
 #************************************************************************
 # root endpoint 
 
@@ -39,17 +88,20 @@ def index():
 # status endpoints 
 
 def _testDataTriggers(statusObj: JobStatus):
-    LwfmEventProcessor().checkDataEvents(statusObj) 
+    # use the service's processor - it holds the index of the data handlers - 
+    # and let it do the matching off the request thread
+    _proc().queueDataEvents(statusObj) 
 
 
 @app.route("/emitStatus", methods=["POST"])
 def emitStatus():
     try:
-        statusBlob = request.form["statusBlob"]
-        statusObj : JobStatus = JobStatus.deserialize(statusBlob)
-        _statusStore.putJobStatus(statusObj)
+        statusObj : JobStatus = _requestObj(JobStatus, "statusBlob")
+        stored = _statusStore.putJobStatus(statusObj)
         if (statusObj.getStatusValue() == "INFO"):
             _testDataTriggers(statusObj)
+        elif (stored):
+            _proc().wakeForStatus(statusObj)
         return "", 200
     except Exception as ex:
         _loggingStore.putLogging("ERROR", "emitStatus: " + str(ex))
@@ -59,7 +111,8 @@ def emitStatus():
 @app.route("/status/<jobId>")
 def getStatus(jobId: str):
     try:
-        s = _statusStore.getJobStatus(jobId).serialize()
+        # pass the stored serialization straight through 
+        s = _statusStore.getJobStatusBlob(jobId)
         if (s is not None):
             return s
         else:
@@ -74,8 +127,12 @@ def getStatus(jobId: str):
 @app.route("/emitLogging", methods=["POST"])
 def emitLogging():
     try:
-        level = request.form["level"]
-        errorMsg = request.form["errorMsg"]
+        if (request.is_json):
+            body = _jsonLoads(request.get_data(cache=False))
+        else:
+            body = request.form
+        level = body["level"]
+        errorMsg = body["errorMsg"]
         _loggingStore.putLogging(level, errorMsg)
         return "", 200
     except Exception as ex:
@@ -89,8 +146,8 @@ def emitLogging():
 @app.route("/setEvent", methods=["POST"])
 def setHandler():
     try:
-        obj = WfEvent.deserialize(request.form["eventObj"])   
-        return wfProcessor.setEventHandler(obj), 200
+        obj = _requestObj(WfEvent, "eventObj")
+        return _proc().setEventHandler(obj), 200
     except Exception as ex:
         _loggingStore.putLogging("ERROR", "setEvent: " + str(ex))
         return "", 400
@@ -99,15 +156,23 @@ def setHandler():
 # unset a given handler
 @app.route("/unsetEvent/<handlerId>")
 def unsetHandler(handlerId: str):
-    wfProcessor.unsetEventHandler(handlerId)
+    _proc().unsetEventHandler(handlerId)
     return "", 200
 
 
-# list the ids of all active handlers
+_EVENT_TYPES = ("run.event.JOB", "run.event.DATA", "run.event.REMOTE")
+
+# list all active handlers
 @app.route("/listEvents")
 def listHandlers():
-    l = wfProcessor.findAllEventHandlers()
-    return [e.serialize() for e in l], 200
+    try:
+        blobs = _eventStore.getAllWfEventBlobs(_EVENT_TYPES)
+        if (not blobs):
+            return _EMPTY_LIST_RESPONSE
+        return _streamList(blobs)
+    except Exception as ex:
+        _loggingStore.putLogging("ERROR", "listEvents: " + str(ex))
+        return "", 400
 
 #************************************************************************
 # data endpoints
@@ -115,9 +180,7 @@ def listHandlers():
 @app.route("/notate", methods=["POST"])
 def notate():
     try:
-        jobId = request.form["jobId"]
-        blob = request.form["data"]
-        sheet = Metasheet.deserialize(blob)
+        sheet = _requestObj(Metasheet, "data")
         _metaStore.putMetaRepo(sheet)
         return "", 200
     except Exception as ex:
@@ -128,15 +191,39 @@ def notate():
 @app.route("/find", methods=["POST"])
 def find():
     try:
-        searchDict = json.loads(request.form["searchDict"])
+        if (request.is_json):
+            searchDict = _jsonLoads(request.get_data(cache=False))
+        else:
+            searchDict = _jsonLoads(request.form["searchDict"])
         l = _metaStore.find(searchDict)
-        return [e.serialize() for e in l], 200
+        if (not l):
+            return _EMPTY_LIST_RESPONSE
+        return _streamList(e.serialize() for e in l)
     except Exception as ex:
         _loggingStore.putLogging("ERROR", "find: " + str(ex))
         return "", 400
 
 
-
-
-
-
+#************************************************************************
+# run the service - a multi-threaded WSGI server when waitress is available, 
+# else Flask's own threaded server.  Keep it to one process: the event 
+# processor and the store live in it.
+
+if __name__ == "__main__":
+    import os
+    port = int(os.environ.get("LWFM_SERVICE_PORT", "3000"))
+    # bring a store from before the per-kind tables up to date, before 
+    # anything reads it
+    splitDefaultTable()
+    # start polling for the handlers already in the store now, not on the 
+    # first request
+    _proc()
+    try:
+        from waitress import serve
+        serve(app, host="127.0.0.1", port=port, 
+              threads=int(os.environ.get("LWFM_SERVICE_THREADS", "16")))
+    except ImportError:
+        # HTTP/1.1 so the clients' keep-alive connections are honored
+        from werkzeug.serving import WSGIRequestHandler
+        WSGIRequestHandler.protocol_version = "HTTP/1.1"
+        app.run(host="127.0.0.1", port=port, threaded=True)
@@ -1,13 +1,19 @@
 # Data stores for job status, metadata, logging, and workflow events.
 
-from typing import List
-from tinydb import TinyDB, Query, where
-from tinydb.table import Document
+from typing import Iterator, List
+from tinydb import TinyDB, Query
+from tinydb.table import Document, Table
+from tinydb.storages import JSONStorage
+import atexit
+import functools
+import json
 import os
+import queue
+import threading
 import time
 
 from lwfm.base.LwfmBase import _IdGenerator
-from lwfm.base.JobStatus import JobStatus
+from lwfm.base.JobStatus import JobStatus, JobStatusValues, _JobStatusFields
 from lwfm.base.Metasheet import Metasheet
 from lwfm.base.WfEvent import WfEvent
 
@@ -17,34 +23,263 @@ from lwfm.base.WfEvent import WfEvent
 _DB_FILE = os.path.join(os.path.expanduser("~"), ".lwfm", "lwfm.repo")
 
 
+# TinyDB is not thread safe - every operation is a read-modify-write of the
+# one shared file handle - and the service touches the store from request,
+# polling and worker threads at once.  Serialize the table operations.
+class _LockedTable(Table):
+    _lock = threading.RLock()
+    # the service looks records up by many different job and event ids - keep 
+    # more than TinyDB's default of 10 query results 
+    QUERY_CACHE_SIZE = 256
+
+    def __init__(self, storage, name: str, cache_size: int = QUERY_CACHE_SIZE, 
+                 persist_empty: bool = False):
+        super().__init__(storage, name, cache_size, persist_empty)
+        self._generation = None
+
+    # TinyDB drops its cached query results when this table writes, but not 
+    # when another process writes the file - drop them when the storage has 
+    # re-read it
+    def _checkGeneration(self) -> None:
+        self._storage.read()
+        generation = getattr(self._storage, "generation", None)
+        if (generation != self._generation):
+            self.clear_cache()
+            self._generation = generation
+
+    def insert(self, *args, **kwargs):
+        with self._lock:
+            return super().insert(*args, **kwargs)
+
+    def insert_multiple(self, *args, **kwargs):
+        with self._lock:
+            return super().insert_multiple(*args, **kwargs)
+
+    def search(self, *args, **kwargs):
+        with self._lock:
+            self._checkGeneration()
+            return super().search(*args, **kwargs)
+
+    def count(self, *args, **kwargs):
+        with self._lock:
+            self._checkGeneration()
+            return super().count(*args, **kwargs)
+
+    def remove(self, *args, **kwargs):
+        with self._lock:
+            return super().remove(*args, **kwargs)
+
+    def all(self):
+        with self._lock:
+            return super().all()
+
+
+class _LockedTinyDB(TinyDB):
+    table_class = _LockedTable
+
+
+# TinyDB's JSON storage re-reads and re-parses the whole file for every query, 
+# and fsyncs it after every write.  Keep the parsed data for as long as the 
+# file is unchanged - another process writing the store changes its mtime or 
+# size - and write through to the file on every write.  Leave the flushed data 
+# to the OS to write back - a crash of the service loses nothing, only a crash
+# of the machine could.
+class _Storage(JSONStorage):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._data = None
+        self._dataKey = None
+        # bumped whenever the data is (re)read from the file, so anything 
+        # derived from it knows to rebuild
+        self.generation = 0
+
+    # A writer in another process which rewrites the file within one tick of 
+    # the file system clock and leaves its size unchanged goes unseen until 
+    # the next change to the file - a risk taken for not re-reading the file 
+    # on every query.  The ctime catches a file whose mtime was set back.  The
+    # stat is of the open handle, so a file replaced rather than rewritten in 
+    # place - TinyDB never does that - is not seen at all.
+    def _fileKey(self) -> tuple:
+        st = os.fstat(self._handle.fileno())
+        return (st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+    # The data is handed out, not a copy, and TinyDB changes it in place 
+    # before it writes it - callers hold _LockedTable._lock, so there is one 
+    # writer at a time in the process.
+    def read(self) -> dict:
+        key = self._fileKey()
+        if (self._data is None) or (key != self._dataKey):
+            self._data = super().read()
+            self._dataKey = key
+            self.generation += 1
+        return self._data
+
+    def write(self, data: dict) -> None:
+        try:
+            self._handle.seek(0)
+            self._handle.write(json.dumps(data, **self.kwargs))
+            self._handle.flush()
+            # the file may have gotten shorter 
+            self._handle.truncate()
+        except Exception:
+            # the data may have been changed in place and not written - read 
+            # it again from the file next time
+            self._data = None
+            raise
+        self._data = data
+        self._dataKey = self._fileKey()
+
+
+
+# Each kind of record lives in its own table, so a query scans only the 
+# records of its own kind.  Stores written before the split kept everything in 
+# TinyDB's default table - the service moves those records into their tables,
+# in one write, when it starts.
+def _tableForPillar(pillar: str) -> str:
+    if (pillar == "auth"):
+        return AuthStore._TABLE
+    if (pillar == "run.status"):
+        return JobStatusStore._TABLE
+    if (pillar == "repo.meta"):
+        return MetaRepoStore._TABLE
+    if (pillar is not None):
+        if (pillar.startswith("run.log.")):
+            return LoggingStore._TABLE
+        if (pillar.startswith("run.event.")):
+            return EventStore._TABLE
+    return None
+
+
+# Rewriting the file races any other process writing it, so only the service 
+# - the store's owner - runs this, at startup.  Clients never migrate.
+def splitDefaultTable() -> None:
+    db = _getTinyDb()
+    with _LockedTable._lock:
+        data = db.storage.read()
+        default = (data or {}).get(TinyDB.default_table_name)
+        if (not default):
+            return
+        for docId, doc in list(default.items()):
+            name = _tableForPillar(doc.get("_pillar"))
+            if (name is not None):
+                data.setdefault(name, {})[docId] = doc
+                del default[docId]
+        db.storage.write(data)
+
+
+# Record timestamps are wall clock nanoseconds, so they order records across 
+# processes and restarts; within a process they are kept strictly increasing 
+# so records put in the same clock tick keep their order.
+_clockLock = threading.Lock()
+_lastTimestamp = 0
+
+def _timestamp() -> int:
+    global _lastTimestamp
+    with _clockLock:
+        ts = time.time_ns()
+        if (ts <= _lastTimestamp):
+            ts = _lastTimestamp + 1
+        _lastTimestamp = ts
+        return ts
+
+
+# Records are never updated in place - a record's doc id always names the same
+# serialization - so the object decoded from it can be kept and handed out 
+# again.  Objects which come back from here are shared: treat them as 
+# read-only.
+@functools.lru_cache(maxsize=4096)
+def _deserializeRecord(cls: type, docId: int, blob: str):
+    return cls.deserialize(blob)
+
+
+# the record fields queries test, built once - a query on a field is a new 
+# object, these are never modified
+_PILLAR = Query()._pillar
+_KEY = Query()._key
+_SITE = Query()._site
+_TIMESTAMP = Query()._timestamp
+
+
+# The store file is opened on first use rather than at import, and only once 
+# however many threads get there together.  A process which imports a store 
+# and never touches it, a site driver's, never reads the file.
+_tinyDb: TinyDB = None
+_tinyDbLock = threading.Lock()
+
+def _getTinyDb() -> TinyDB:
+    global _tinyDb
+    if (_tinyDb is None):
+        with _tinyDbLock:
+            if (_tinyDb is None):
+                # compact separators - the whole file is rewritten on every put 
+                _tinyDb = _LockedTinyDB(_DB_FILE, storage=_Storage, 
+                                        separators=(",", ":"))
+    return _tinyDb
+
 
 class Store():
-    _db = TinyDB(_DB_FILE)
+    _TABLE = TinyDB.default_table_name
+
+    def __init__(self):
+        self._table = None
+
+    @property
+    def _tinyDb(self) -> TinyDB:
+        return _getTinyDb()
+
+    @property
+    def _db(self) -> Table:
+        if (self._table is None):
+            self._table = _getTinyDb().table(self._TABLE)
+        return self._table
         
+    # fields are extra record fields - values a query can test without 
+    # deserializing the doc
+    def _makeDocument(self, siteName: str, pillar: str, key: str, doc: str, 
+                      collapse_doc: bool = False, fields: dict = None) -> Document:
+        id = _IdGenerator().generateInteger()
+        ts = _timestamp()
+        if (key is None) or (key == ""):
+            key = ts
+        baseRecord = {
+            "_db_id": id,
+            "_site": siteName,
+            "_pillar": pillar,
+            "_key": key,
+            "_timestamp": ts
+        }
+        if (fields):
+            baseRecord.update(fields)
+        if (collapse_doc):
+            record = {**baseRecord, **doc}
+        else:
+            record = baseRecord
+            record["_doc"] = doc    # the data, serialized object, etc
+        return Document(record, doc_id=id)
+
+    # returns the document put, or None if it could not be 
     def _put(self, siteName: str, pillar: str, key: str, doc: str, 
-             collapse_doc: bool = False) -> None:
+             collapse_doc: bool = False, fields: dict = None) -> Document:
         try:
-            id = _IdGenerator().generateInteger()
-            ts = time.perf_counter_ns()
-            if (key is None) or (key == ""):
-                key = ts
-            baseRecord = {
-                "_db_id": id,
-                "_site": siteName,
-                "_pillar": pillar,
-                "_key": key,
-                "_timestamp": ts
-            }
-            if (collapse_doc):
-                record = {**baseRecord, **doc}
-            else:
-                record = baseRecord
-                record["_doc"] = doc    # the data, serialized object, etc
-            self._db.insert(Document(record, doc_id=id))
-            return
+            document = self._makeDocument(siteName, pillar, key, doc, collapse_doc, 
+                                          fields)
+            self._db.insert(document)
+            return document
         except Exception as ex:
             print("Error in _put: " + str(ex))
+            return None
 
+    # put many documents in one write to the store; rows are tuples of the 
+    # _put args 
+    def _putMany(self, rows: List[tuple]) -> None:
+        try:
+            self._db.insert_multiple([self._makeDocument(*row) for row in rows])
+        except Exception as ex:
+            print("Error in _putMany: " + str(ex))
+
+
+    def _deserialize(self, cls: type, record: Document):
+        return _deserializeRecord(cls, record.doc_id, record["_doc"])
 
     def _sortMostRecent(self, docs: List[dict]) -> List[dict]:
         return sorted(docs, key=lambda x: x['_timestamp'], reverse=True)
@@ -53,12 +288,12 @@ class Store():
 # ****************************************************************************
 
 class AuthStore(Store):
+    _TABLE = "auth"
     def __init__(self):
         super(AuthStore, self).__init__()
 
     def getAllAuth(self) -> List[str]:
-        Q = Query()
-        results = self._db.search((Q._pillar == "auth"))
+        results = self._db.all()
         if (results is not None): 
             blobs = self._sortMostRecent(results)
             return [({ "site": blob["_site"], "auth": blob["_doc"] }) for blob in blobs]
@@ -66,10 +301,10 @@ class AuthStore(Store):
     
     # return the site-specific auth blob for this site
     def getAuthForSite(self, siteName: str) -> str:
-        Q = Query()
-        result = self._db.search((Q._site == siteName) & (Q._pillar == "auth") & (Q._key == "auth"))
-        if (result is not None): 
-            return result[0]["_doc"]
+        result = self._db.search((_SITE == siteName) & (_KEY == "auth"))
+        if (result): 
+            # the most recently put, in one pass 
+            return max(result, key=lambda x: x['_timestamp'])["_doc"]
         return None
 
     # set the site-specific auth blob for this site
@@ -80,30 +315,111 @@ class AuthStore(Store):
 # ****************************************************************************
 
 class LoggingStore(Store):
+    _TABLE = "logging"
     def __init__(self):
         super(LoggingStore, self).__init__()
 
-    def getAllLogging(self, level: str) -> List[str]:
-        Q = Query()
-        results = self._db.search((Q._pillar == level))
-        if (results is not None): 
-            blobs = self._sortMostRecent(results)
-            return [({ "ts": blob["_timestamp"], "log": blob["_doc"] }) for blob in blobs]
-        return None
+    def getAllLogging(self, level: str, since: int = None) -> List[str]:
+        return list(self.iterLogging(level, since))
+
+    # the records of the level, most recent first, produced as they are 
+    # consumed rather than all built up front.  Pass the newest "ts" of an 
+    # earlier result as since to get only the records put after it.
+    def iterLogging(self, level: str, since: int = None) -> Iterator[dict]:
+        query = (_PILLAR == level)
+        if (since is not None):
+            query = query & (_TIMESTAMP > since)
+        for blob in self._sortMostRecent(self._db.search(query)):
+            yield { "ts": blob["_timestamp"], "log": blob["_doc"] }
 
     # put a record in the logging store
     def putLogging(self, level: str, doc: str) -> None:
         self._put("local", "run.log." + level, None, doc)
 
+    # put a batch of (level, doc) records in the logging store in one write
+    def putLoggingBatch(self, rows: List[tuple]) -> None:
+        if (rows):
+            self._putMany([("local", "run.log." + level, None, doc) 
+                           for (level, doc) in rows])
+
+
+# stateless - one instance serves every store's own error logging
+_sharedLoggingStore = LoggingStore()
+
+
+# A logging store which queues records and writes them in batches from a 
+# background thread, so a busy caller pays for one store write per batch 
+# rather than one per log line.  Records are visible once flushed; whatever is
+# still queued is flushed at interpreter exit.
+class BufferedLoggingStore(LoggingStore):
+    BATCH_SIZE = 256
+    FLUSH_SECONDS = 0.2
+
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    # the process's shared buffered store, so its loggers share one queue, one 
+    # flusher thread, and one store write per batch
+    @classmethod
+    def getInstance(cls) -> "BufferedLoggingStore":
+        if (cls._instance is None):
+            with cls._instanceLock:
+                if (cls._instance is None):
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super(BufferedLoggingStore, self).__init__()
+        self._queue = queue.SimpleQueue()
+        self._stopEvent = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name="lwfm-log-flush", 
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def putLogging(self, level: str, doc: str) -> None:
+        # once closed nothing drains the queue, and the flusher's own records 
+        # needn't make a round trip through it - write those straight through
+        if (self._stopEvent.is_set()) or \
+           (threading.get_ident() == self._flusher.ident):
+            super().putLogging(level, doc)
+            return
+        self._queue.put((level, doc))
+
+    def _drain(self) -> List[tuple]:
+        rows = []
+        while (len(rows) < self.BATCH_SIZE):
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def flush(self) -> None:
+        rows = self._drain()
+        while (rows):
+            self.putLoggingBatch(rows)
+            rows = self._drain()
+
+    def _run(self) -> None:
+        while not self._stopEvent.wait(self.FLUSH_SECONDS):
+            self.flush()
+        self.flush()
+
+    def close(self, timeout: float = 1) -> None:
+        self._stopEvent.set()
+        self._flusher.join(timeout=timeout)
+
 
 # ****************************************************************************
 
 class EventStore(Store):
+    _TABLE = "events"
     _loggingStore: LoggingStore = None
 
     def __init__(self):
         super(EventStore, self).__init__()
-        self._loggingStore = LoggingStore()
+        self._loggingStore = _sharedLoggingStore
 
     def putWfEvent(self, datum: WfEvent, typeT: str) -> bool: 
         try: 
@@ -115,21 +431,47 @@ class EventStore(Store):
             return False
 
     def getAllWfEvents(self, typeT: str = None) -> List[WfEvent]: 
-        Q = Query()
-        results = self._db.search((Q._pillar == typeT))
-        if (results is not None):
-            blobs = self._sortMostRecent(results)
-            return [WfEvent.deserialize(blob["_doc"]) for blob in blobs]
-        return None
+        return list(self.iterWfEvents(typeT))
+
+    # the events of the type, most recent first, each deserialized as it is 
+    # consumed
+    def iterWfEvents(self, typeT: str = None) -> Iterator[WfEvent]:
+        for blob in self._sortMostRecent(self._db.search((_PILLAR == typeT))):
+            yield self._deserialize(WfEvent, blob)
+
+    # fetch the events of several types in one pass over the store, returned
+    # as a dict keyed by type, each list in most recent first order
+    def getAllWfEventsByType(self, typeTs: tuple) -> dict:
+        buckets = {typeT: [] for typeT in typeTs}
+        results = self._db.search(_PILLAR.one_of(list(typeTs)))
+        for blob in self._sortMostRecent(results):
+            buckets[blob["_pillar"]].append(self._deserialize(WfEvent, blob))
+        return buckets
+
+    # the stored serializations of the events of the given types, most recent
+    # first - for passing straight through without a deserialize round trip
+    def getAllWfEventBlobs(self, typeTs: tuple) -> List[str]:
+        results = self._db.search(_PILLAR.one_of(list(typeTs)))
+        return [blob["_doc"] for blob in self._sortMostRecent(results)]
+
+    def countWfEvents(self, typeTs: tuple) -> int:
+        return self._db.count(_PILLAR.one_of(list(typeTs)))
 
     def deleteAllWfEvents(self) -> None:
-        q = Query()
-        self._db.remove(q._pillar == 'run.event')
+        self._db.remove(_PILLAR == 'run.event')
+
+    # remove many handlers in one pass over the store
+    def deleteWfEvents(self, eventIds: List[str]) -> bool:
+        try: 
+            self._db.remove(_KEY.one_of(list(eventIds)))
+            return True
+        except Exception as e:
+            self._loggingStore.putLogging("ERROR", "Error in deleteWfEvents: " + str(e))
+            return False
 
     def deleteWfEvent(self, eventId: str) -> bool:
         try: 
-            q = Query()
-            self._db.remove(q._key == eventId)
+            self._db.remove(_KEY == eventId)
             return True
         except Exception as e:
             self._loggingStore.putLogging("ERROR", "Error in deleteWfEvent: " + str(e))
@@ -139,48 +481,118 @@ class EventStore(Store):
 # ****************************************************************************
 
 class JobStatusStore(Store):
+    _TABLE = "status"
     _loggingStore: LoggingStore = None
 
+    # the newest status record of each job, shared by every instance - rebuilt
+    # when the store is (re)read from its file, else kept up to date by puts
+    _latest: dict = {}
+    _latestGeneration: int = None
+
     def __init__(self):
         super(JobStatusStore, self).__init__()
-        self._loggingStore = LoggingStore()
-
-    def putJobStatus(self, datum: JobStatus) -> None: 
-        self._put(datum.getJobContext().getSiteName(), 
-                  "run.status", datum.getJobId(), datum.serialize())
+        self._loggingStore = _sharedLoggingStore
+
+    def _latestIndex(self) -> dict:
+        storage = self._tinyDb.storage
+        with _LockedTable._lock:
+            storage.read()
+            if (JobStatusStore._latestGeneration != storage.generation):
+                latest = {}
+                for record in self._db.all():
+                    newest = latest.get(record["_key"])
+                    if (newest is None) or (record["_timestamp"] > newest["_timestamp"]):
+                        latest[record["_key"]] = record
+                JobStatusStore._latest = latest
+                JobStatusStore._latestGeneration = storage.generation
+            return JobStatusStore._latest
+
+    # what differs between two reports of the same status 
+    _REPORT_FIELDS = ("id", _JobStatusFields.EMIT_TIME.value, 
+                      _JobStatusFields.RECEIVED_TIME.value)
+
+    def _reported(self, datum: JobStatus) -> dict:
+        return {k: v for (k, v) in datum.getArgs().items() 
+                if k not in self._REPORT_FIELDS}
+
+    # is the status a re-report of the job's newest record - the same values 
+    # in the same context, only emitted later?  A site driver polling a 
+    # remote job re-reports RUNNING every tick.  INFO is never a repeat: it 
+    # carries data.
+    def _isRepeat(self, datum: JobStatus, newest: Document) -> bool:
+        if (newest is None) or (newest.get("_status") != datum.getStatusValue()) \
+            or (datum.getStatus() == JobStatusValues.INFO):
+            return False
+        prev = self._deserialize(JobStatus, newest)
+        return (self._reported(prev) == self._reported(datum)) and \
+            (prev.getJobContext().getArgs() == datum.getJobContext().getArgs())
+
+    # returns whether the status was stored - a repeat of the job's latest is not
+    def putJobStatus(self, datum: JobStatus) -> bool: 
+        with _LockedTable._lock:
+            if (self._isRepeat(datum, self._latestIndex().get(datum.getJobId()))):
+                return False
+            # the status value is kept alongside the serialization, so lookups
+            # by value don't unpickle every record they pass over
+            status = datum.getStatus()
+            record = self._put(datum.getJobContext().getSiteName(), 
+                               "run.status", datum.getJobId(), datum.serialize(), 
+                               fields={"_status": getattr(status, "value", None)})
+            if (record is not None):
+                latest = self._latestIndex()
+                newest = latest.get(record["_key"])
+                if (newest is None) or (record["_timestamp"] > newest["_timestamp"]):
+                    latest[record["_key"]] = record
+            return record is not None
 
-    def _getAllJobStatuses(self) -> List[JobStatus]:
+    def getAllJobStatuses(self, jobId: str) -> List[JobStatus]:
         try:
-            Q = Query()
-            results = self._db.search((Q._pillar == "run.status"))
-            if (results is not None): 
-                blobs = self._sortMostRecent(results)
-                return [JobStatus.deserialize(blob["_doc"]) for blob in blobs]
-            return None
+            return list(self.iterJobStatuses(jobId))
         except Exception as e:
             self._loggingStore.putLogging("ERROR", "Error in getAllJobStatuses: " + str(e))
-            return None        
-
+            return None
 
-    def getAllJobStatuses(self, jobId: str) -> List[JobStatus]:
+    # the statuses of the job - of every job if None - most recent first, 
+    # each deserialized as it is consumed rather than all up front 
+    def iterJobStatuses(self, jobId: str = None) -> Iterator[JobStatus]:
         if (jobId is None):
-            return self._getAllJobStatuses()
+            results = self._db.all()
+        else:
+            results = self._db.search((_KEY == jobId))
+        for blob in self._sortMostRecent(results):
+            yield JobStatus.deserialize(blob["_doc"])
+        
+    # the most recent status of the job with the given status value, or None -
+    # only the match is deserialized, plus any records stored before the 
+    # status value was kept with them
+    def findJobStatus(self, jobId: str, statusValue: str) -> JobStatus:
         try:
-            Q = Query()
-            results = self._db.search((Q._pillar == "run.status") & (Q._key == jobId))
-            if (results is not None): 
-                blobs = self._sortMostRecent(results)
-                return [JobStatus.deserialize(blob["_doc"]) for blob in blobs]
+            results = self._db.search((_KEY == jobId))
+            for blob in self._sortMostRecent(results):
+                value = blob.get("_status")
+                if (value is None):
+                    value = self._deserialize(JobStatus, blob).getStatus().value
+                if (value == statusValue):
+                    return self._deserialize(JobStatus, blob)
             return None
         except Exception as e:
-            self._loggingStore.putLogging("ERROR", "Error in getAllJobStatuses: " + str(e))
+            self._loggingStore.putLogging("ERROR", "Error in findJobStatus: " + str(e))
             return None
-        
+
+    # the stored serialization of the job's most recent status, or None - a 
+    # lookup in the index of newest records rather than a scan of the table
+    def getJobStatusBlob(self, jobId: str) -> str:
+        record = self._latestIndex().get(jobId)
+        if (record is not None):
+            return record["_doc"]
+        return None
+
     def getJobStatus(self, jobId: str) -> JobStatus:    
         try:
-            statuses = self.getAllJobStatuses(jobId)
-            if (statuses is not None) and (len(statuses) > 0):
-                return statuses[0]  
+            # only the most recent record needs deserializing 
+            blob = self.getJobStatusBlob(jobId)
+            if (blob is not None):
+                return JobStatus.deserialize(blob)
             else:
                 return None
         except Exception as e:
@@ -193,30 +605,31 @@ class JobStatusStore(Store):
 # MetaRepo Store
 
 class MetaRepoStore(Store):
+    _TABLE = "meta"
     _loggingStore: LoggingStore = None
 
     def __init__(self):
         super(MetaRepoStore, self).__init__()
-        self._loggingStore = LoggingStore()
+        self._loggingStore = _sharedLoggingStore
 
     def putMetaRepo(self, datum: Metasheet) -> None:
         self._put("None", "repo.meta", datum.getId(), datum.getArgs(), True)
 
     def getAllMetasheets(self) -> List[Metasheet]:
-        Q = Query()
-        results = self._db.search((Q._pillar == "repo.meta"))
-        if (results is not None): 
-            return [Metasheet(blob) for blob in results]
+        return list(self.iterMetasheets())
+
+    # each metasheet built as it is consumed 
+    def iterMetasheets(self) -> Iterator[Metasheet]:
+        for blob in self._db.all():
+            yield Metasheet(blob)
                 
     def find(self, queryRegExs: dict) -> List[Metasheet]:
         try: 
-            qStr = None
-            for (k, v) in queryRegExs.items():
-                if (qStr is None):
-                    qStr = "where('" + k + "') == '" + v + "'"
-                else:
-                    qStr = qStr + " and where('" + k + "') == '" + v + "'"
-            blobs = self._db.search(eval(qStr))
+            # one fragment test per record, rather than a chain of and'ed 
+            # field tests
+            if (not queryRegExs):
+                return None
+            blobs = self._db.search(Query().fragment(queryRegExs))
             if (blobs is not None): 
                 return [Metasheet(blob) for blob in blobs]
             return None
@@ -239,24 +652,24 @@ if __name__ == "__main__":
         print(authStore.getAllAuth())
     elif (sys.argv[1] == "run.log.ERROR") or (sys.argv[1] == "run.log.INFO"):
         logStore = LoggingStore()
-        for log in logStore.getAllLogging(sys.argv[1]):
+        for log in logStore.iterLogging(sys.argv[1]):
             print(log)
     elif (sys.argv[1] == "run.status"):
         statusStore = JobStatusStore()
-        for status in statusStore.getAllJobStatuses(None):
+        for status in statusStore.iterJobStatuses():
             print(status)
     elif (sys.argv[1] == "repo.meta"):
         metaStore = MetaRepoStore()
-        for meta in metaStore.getAllMetasheets():
+        for meta in metaStore.iterMetasheets():
             print(meta)
     elif (sys.argv[1].startswith("run.event")):
         eventStore = EventStore()
-        for event in eventStore.getAllWfEvents(sys.argv[1]):
+        for event in eventStore.iterWfEvents(sys.argv[1]):
             print(event)
     elif (sys.argv[1] == "all"):
-        store = Store()
-        for doc in store._db.all():
-            print(f"*** {doc}")
+        for name in _getTinyDb().tables():
+            for doc in _getTinyDb().table(name).all():
+                print(f"*** {doc}")
     else:
         print("Unknown type: " + sys.argv[1])
 
@@ -3,8 +3,10 @@
 from enum import Enum
 from typing import List
 import io
+import threading
 
-from lwfm.base.Site import Site, SiteAuth, SiteRun, SiteRepo, SiteSpin
+from lwfm.base.Site import Site, SiteAuth, SiteRun, SiteRepo, SiteSpin, \
+    JobNotFoundException
 from lwfm.base.JobDefn import JobDefn
 from lwfm.base.JobStatus import JobStatus, JobStatusValues
 from lwfm.base.JobContext import JobContext
@@ -16,6 +18,7 @@ from lwfm.sites.LocalSite import LocalSiteRepo
 
 from qiskit import QuantumCircuit, qpy
 from qiskit_ibm_runtime import SamplerV2 as Sampler, QiskitRuntimeService
+from qiskit_ibm_runtime.exceptions import RuntimeJobNotFound
 from qiskit.transpiler.preset_passmanagers import generate_preset_pass_manager
 from qiskit_ibm_runtime.fake_provider import FakeManilaV2
 
@@ -23,6 +26,23 @@ from qiskit_ibm_runtime.fake_provider import FakeManilaV2
 
 SITE_NAME = "ibm_quantum"
 
+# constructing the runtime service reads the saved account and calls out to 
+# IBM - build it once and share it, and rebuild after a new login
+_service: QiskitRuntimeService = None
+_serviceLock = threading.Lock()
+
+def _getService() -> QiskitRuntimeService:
+    global _service
+    with _serviceLock:
+        if _service is None:
+            _service = QiskitRuntimeService()
+        return _service
+
+def _resetService() -> None:
+    global _service
+    with _serviceLock:
+        _service = None
+
 # the job status codes for IBM Quantum site - see constructor below for mapping
 # to lwfm canonical status strings
 class IBMQuantumJobStatusValues(Enum):
@@ -41,20 +61,21 @@ class IBMQuantumJobStatusValues(Enum):
 
 
 class IBMQuantumJobStatus(JobStatus):
+    # override the default status mapping for the specifics of this site
+    statusMap = {
+        IBMQuantumJobStatusValues.INITIALIZING.value  : JobStatusValues.READY    ,
+        IBMQuantumJobStatusValues.QUEUED.value        : JobStatusValues.PENDING  ,
+        IBMQuantumJobStatusValues.VALIDATING.value    : JobStatusValues.PENDING  ,
+        IBMQuantumJobStatusValues.RUNNING.value       : JobStatusValues.RUNNING  ,
+        IBMQuantumJobStatusValues.CANCELLED.value     : JobStatusValues.CANCELLED,
+        # nothing in IBM maps to lwfm FINISHING
+        IBMQuantumJobStatusValues.DONE.value          : JobStatusValues.COMPLETE ,
+        IBMQuantumJobStatusValues.ERROR.value         : JobStatusValues.FAILED   ,
+        IBMQuantumJobStatusValues.INFO.value          : JobStatusValues.INFO     ,
+        }
+
     def __init__(self, jobContext: JobContext = None):
         super(IBMQuantumJobStatus, self).__init__(jobContext)
-        # override the default status mapping for the specifics of this site
-        self.setStatusMap({
-            IBMQuantumJobStatusValues.INITIALIZING.value  : JobStatusValues.READY    ,
-            IBMQuantumJobStatusValues.QUEUED.value        : JobStatusValues.PENDING  ,
-            IBMQuantumJobStatusValues.VALIDATING.value    : JobStatusValues.PENDING  ,
-            IBMQuantumJobStatusValues.RUNNING.value       : JobStatusValues.RUNNING  ,
-            IBMQuantumJobStatusValues.CANCELLED.value     : JobStatusValues.CANCELLED,
-            # nothing in IBM maps to lwfm FINISHING
-            IBMQuantumJobStatusValues.DONE.value          : JobStatusValues.COMPLETE ,
-            IBMQuantumJobStatusValues.ERROR.value         : JobStatusValues.FAILED   ,
-            IBMQuantumJobStatusValues.INFO.value          : JobStatusValues.INFO     ,
-            })
         self.getJobContext().setSiteName(SITE_NAME)
 
 
@@ -72,6 +93,7 @@ class IBMQuantumSiteAuth(SiteAuth):
                 token=token_data, 
                 overwrite=True,
                 set_as_default=True)
+            _resetService()
             Logger.info("IBM Quantum login successful")
             return True
         except Exception as e:
@@ -97,16 +119,22 @@ class IBMQuantumSiteRun(SiteRun):
         if (status.isTerminal()):
             return status
         # its not terminal yet, so poke the remote site using the native id
-        service = QiskitRuntimeService()
-        job = service.job(status.getJobContext().getNativeId())
+        service = _getService()
+        try:
+            job = service.job(status.getJobContext().getNativeId())
+        except RuntimeJobNotFound as ex:
+            # IBM no longer has the job 
+            raise JobNotFoundException(str(ex)) from ex
         if (job is None):
             return status
+        # each status() is a round trip to IBM - ask once
+        jobStatus = job.status()
         status = IBMQuantumJobStatus(status.getJobContext())
-        status.setNativeStatus(job.status())
-        if (job.status() == "DONE"):
+        status.setNativeStatus(jobStatus)
+        if (jobStatus == "DONE"):
             status.setNativeInfo(str(job.result()[0].data.meas.get_counts()))
         LwfManager.emitStatus(status.getJobContext(), IBMQuantumJobStatus, 
-                              job.status(), status.getNativeInfo())
+                              jobStatus, status.getNativeInfo())
         return status
 
 
@@ -117,13 +145,12 @@ class IBMQuantumSiteRun(SiteRun):
         
         try: 
             # transpile the circuit to match the backend
-            service = QiskitRuntimeService()
             if (computeType is None):
                 computeType = "FakeManilaV2"
             if (computeType == "FakeManilaV2"):
                 backend = FakeManilaV2()
             else:
-                backend = service.backend(computeType)
+                backend = _getService().backend(computeType)
             pm = generate_preset_pass_manager(backend=backend, optimization_level=1)
             isa_circuit = pm.run(qpy.load(io.BytesIO(jDefn.getEntryPoint())))
             # run the circuit
@@ -136,7 +163,7 @@ class IBMQuantumSiteRun(SiteRun):
             results = None
             if (computeType == "FakeManilaV2"):
                 # simulator runs now 
-                print("running circuit in simulator")
+                Logger.info("running circuit in simulator")
                 job = sampler.run([isa_circuit], shots=shots)
                 useContext.setNativeId(LwfManager.generateId())
             else:
@@ -147,8 +174,6 @@ class IBMQuantumSiteRun(SiteRun):
 
             useContext.setSiteName(SITE_NAME)
             useContext.setComputeType(computeType)
-            
-            print(useContext)
 
             # now that we have the native job id we can emit status 
             LwfManager.emitStatus(useContext, IBMQuantumJobStatus, 
@@ -203,7 +228,7 @@ class IBMQuantumSiteRepo(LocalSiteRepo):
 class IBMQuantumSiteSpin(SiteSpin):
 
     def listComputeTypes(self) -> List[str]:
-        service = QiskitRuntimeService()
+        service = _getService()
         leastBackend = service.least_busy(simulator=False, operational=True)
         backends = service.backends()
         l = list()
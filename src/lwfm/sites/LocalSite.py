@@ -3,10 +3,13 @@
 # Unsecure, as this is local and we assume the user is themselves already.
 
 from pathlib import Path
+import functools
 import shutil
 from typing import List
 import os, subprocess
-import multiprocessing
+import re
+import shlex
+import threading
 
 from lwfm.base.Site import Site, SiteAuth, SiteRun, SiteRepo, SiteSpin
 from lwfm.base.JobDefn import JobDefn
@@ -17,6 +20,33 @@ from lwfm.midware.LwfManager import LwfManager
 from lwfm.midware.Logger import Logger
 
 
+# *********************************************************************
+
+# anything the shell would interpret - globs, redirects, pipes, expansions, 
+# env assignments - means the command line needs a shell to run it
+_SHELL_META = re.compile(r"[|&;<>()$`\\*?\[\]#~={}!\n]")
+
+
+# start a job's process.  Keep this eligible for the posix_spawn() fast path 
+# in subprocess - no preexec_fn, cwd, pass_fds or new session - so a big 
+# parent interpreter is not forked to launch it.  Descriptors Python opens are 
+# non-inheritable anyway, so close_fds is not needed for that.  The job gets 
+# no stdin: it runs in the background of this process.
+def _spawn(args, env: dict, shell: bool = False) -> subprocess.Popen:
+    executable = None
+    if not (shell):
+        # posix_spawn() wants the program's full path 
+        executable = _which(args[0], env.get("PATH"))
+    return subprocess.Popen(args, executable=executable, shell=shell, env=env, 
+                            close_fds=False, stdin=subprocess.DEVNULL)
+
+
+# the full path of a job's program, looked up once per program and PATH 
+@functools.lru_cache(maxsize=128)
+def _which(program: str, path: str) -> str:
+    return shutil.which(program, path=path)
+
+
 # *********************************************************************
 
 
@@ -60,14 +90,33 @@ class LocalSiteRun(SiteRun):
         try:
             # This is synchronous, so we wait here until the subprocess is over.
             cmd = jDefn.getEntryPoint()
-            if jDefn.getJobArgs() is not None:
-                for arg in jDefn.getJobArgs():
-                    cmd += " " + arg
+            if jDefn.getJobArgs():
+                cmd = " ".join([cmd, *jDefn.getJobArgs()])
             # copy the current shell environment into the subprocess
             # and inject the job id
             env = os.environ.copy()
             env['_LWFM_JOB_ID'] = jobContext.getId()
-            subprocess.run(cmd, shell=True, env=env)
+            # a plain command line is exec'd directly rather than through an 
+            # intermediate /bin/sh
+            proc = None
+            if not (_SHELL_META.search(cmd)):
+                try:
+                    args = shlex.split(cmd)
+                    if (args):
+                        proc = _spawn(args, env)
+                except (OSError, ValueError):
+                    pass    # not an executable, a script with no #! line, or 
+                            # unbalanced quotes - let the shell have it
+            if (proc is None):
+                proc = _spawn(cmd, env, shell=True)
+            self._pendingJobs[jobContext.getId()] = proc
+            try:
+                proc.wait()
+            finally:
+                # cancel() leaves None in place of a job it has terminated
+                cancelled = self._pendingJobs.pop(jobContext.getId(), None) is None
+            if (cancelled):
+                return      # cancel() has already emitted the terminal status
             # Emit success statuses
             LwfManager.emitStatus(jobContext, LocalJobStatus, 
                                   JobStatusValues.FINISHING.value)
@@ -109,8 +158,11 @@ class LocalSiteRun(SiteRun):
             LwfManager.emitStatus(useContext, LocalJobStatus, 
                                 JobStatusValues.PENDING.value)
             # Run the job in a new thread so we can wrap it in a bit more code
-            # this will kick the status the rest of the way to a terminal state 
-            multiprocessing.Process(target=self._runJob, args=[jDefn, useContext]).start()
+            # this will kick the status the rest of the way to a terminal state - 
+            # the job itself is a child process, so there's no need to fork 
+            # this whole interpreter to wait on it 
+            threading.Thread(target=self._runJob, args=[jDefn, useContext], 
+                             name="lwfm-local-" + useContext.getId()).start()
             Logger.info("LocalSite: submitted job %s" % (useContext.getId()))
             return LwfManager.getStatus(useContext.getId())
         except Exception as ex:
@@ -119,23 +171,23 @@ class LocalSiteRun(SiteRun):
 
 
     def cancel(self, jobContext: JobContext) -> bool:
-        # Find the locally running thread and kill it
+        # Find the locally running process and kill it
         try:
-            thread = self._pendingJobs[jobContext.getId()]
-            if thread is None:
+            proc = self._pendingJobs.get(jobContext.getId())
+            if proc is None:
                 return False
+            self._pendingJobs[jobContext.getId()] = None
             Logger.info(
                 "LocalSiteDriver.cancelJob(): calling terminate on job "
                 + jobContext.getId()
             )
-            thread.terminate()
-            jStatus = LocalJobStatus(jobContext)
-            jStatus.emit(JobStatusValues.CANCELLED.value)
-            self._pendingJobs[jobContext.getId()] = None
+            proc.terminate()
+            LwfManager.emitStatus(jobContext, LocalJobStatus, 
+                                  JobStatusValues.CANCELLED.value)
             return True
         except Exception as ex:
             Logger.error(
-                "ERROR: Could not cancel job %d: %s" % (jobContext.getId(), ex)
+                "ERROR: Could not cancel job %s: %s" % (jobContext.getId(), ex)
             )
             return False
 
@@ -222,10 +274,7 @@ class InSituSite(LocalSite):
 
     SITE_NAME = "insitu"
 
-    def __init__(self):
-        super(InSituSite, self).__init__(
-            self.SITE_NAME, LocalSiteAuth(), LocalSiteRun(), LocalSiteRepo(), LocalSiteSpin()
-        )
+    # LocalSite's constructor already builds its drivers under SITE_NAME
 
 
 